@@ -7,14 +7,20 @@ Automates opening Claude Code in new terminals for each subdirectory
 import os
 import sys
 import time
-import platform
+import shlex
+import shutil
 import subprocess
+import functools
 import argparse
 import logging
 from pathlib import Path
 from typing import List, Optional, Tuple
 import json
 import signal
+import stat
+import string
+import asyncio
+from operator import attrgetter
 
 # Add colorama for cross-platform colored output
 try:
@@ -32,136 +38,31 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('claudecoderun.log'),
+        logging.FileHandler('claudecoderun.log', delay=True),
         logging.StreamHandler()
     ]
 )
 logger = logging.getLogger(__name__)
 
-class ClaudeCodeRunner:
-    """Main class for automating Claude Code terminals"""
-    
-    def __init__(self, base_dir: str, coderun_file: str = "coderun.md", 
-                 init_file: str = "coderun_init.md", delay: int = 2,
-                 wsl_distro: str = "Ubuntu"):
-        """
-        Initialize the ClaudeCodeRunner
-        
-        Args:
-            base_dir: Base directory to scan for subdirectories
-            coderun_file: Main instruction file
-            init_file: Initialization instruction file
-            delay: Delay between launching terminals
-            wsl_distro: WSL distribution name (default: Ubuntu)
-        """
-        self.base_dir = Path(base_dir).resolve()
-        self.coderun_file = coderun_file
-        self.init_file = init_file
-        self.delay = delay
-        self.wsl_distro = wsl_distro
-        self.platform = self._detect_platform()
-        self.terminal_cmd = self._get_terminal_command()
-        
-        logger.info(f"Initialized ClaudeCodeRunner for {self.platform} platform")
-        logger.info(f"Base directory: {self.base_dir}")
-    
-    def _detect_platform(self) -> str:
-        """Detect the current platform"""
-        system = platform.system().lower()
-        if system == "linux" and "microsoft" in platform.uname().release.lower():
-            return "wsl"
-        elif system == "darwin":
-            return "macos"
-        elif system == "linux":
-            return "linux"
-        else:
-            raise RuntimeError(f"Unsupported platform: {system}")
-    
-    def _get_terminal_command(self) -> List[str]:
-        """Get the appropriate terminal command for the platform"""
-        if self.platform == "wsl":
-            # Check for Windows Terminal first
-            try:
-                subprocess.run(["wt.exe", "--version"], capture_output=True, check=True)
-                return ["wt.exe", "-d"]
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                # Fallback to cmd.exe
-                return ["cmd.exe", "/c", "start", "cmd.exe", "/k", "wsl", "-d", self.wsl_distro, "--cd"]
-        
-        elif self.platform == "macos":
-            # Use osascript to open Terminal.app
-            return ["osascript", "-e"]
-        
-        elif self.platform == "linux":
-            # Try common terminal emulators
-            terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
-            for term in terminals:
-                try:
-                    subprocess.run([term, "--version"], capture_output=True, check=True)
-                    if term == "gnome-terminal":
-                        return [term, "--working-directory"]
-                    else:
-                        return [term, "--workdir"]
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    continue
-            raise RuntimeError("No supported terminal emulator found")
-    
-    def get_subdirectories(self, exclude: Optional[List[str]] = None) -> List[Path]:
-        """
-        Get all subdirectories in the base directory
-        
-        Args:
-            exclude: List of directory names to exclude
-            
-        Returns:
-            List of subdirectory paths
-        """
-        exclude = exclude or []
-        subdirs = []
-        
-        try:
-            for item in self.base_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    if item.name not in exclude:
-                        subdirs.append(item)
-                        logger.info(f"Found directory: {item.name}")
-        except Exception as e:
-            logger.error(f"Error scanning directories: {e}")
-            raise
-        
-        return sorted(subdirs)
-    
-    def create_automation_script(self, directory: Path) -> Path:
-        """
-        Create a temporary automation script for the directory
-        
-        Args:
-            directory: Target directory
-            
-        Returns:
-            Path to the created script
-        """
-        script_name = f"claude_automation_{directory.name}.sh"
-        script_path = directory / script_name        
-        # Read instruction files
-        coderun_content = self._read_instruction_file(self.coderun_file)
-        init_content = self._read_instruction_file(self.init_file)
-        
-        # Create the automation script
-        script_content = f"""#!/bin/bash
-# Claude Code Automation Script for {directory.name}
+# Escapes instruction file content for embedding in the script in one pass
+_ESCAPE_TABLE = str.maketrans({'\n': '\\n', '"': '\\"'})
+
+# Automation script template, parsed once at import. safe_substitute() is used
+# so bash variables such as $PLATFORM and $1 are left untouched.
+_SCRIPT_TEMPLATE = string.Template("""#!/bin/bash
+# Claude Code Automation Script for ${dir_name}
 # Generated by ClaudeCodeRunner
 
 set -e  # Exit on error
 
-echo "Starting Claude Code automation for {directory.name}"
-cd "{directory}"
+echo "Starting Claude Code automation for ${dir_name}"
+cd "${dir_path}"
 
 # Detect platform
 PLATFORM=$(uname -s)
 
 # Function to set clipboard content
-set_clipboard() {{
+set_clipboard() {
     if [[ "$PLATFORM" == "Darwin" ]]; then
         echo "$1" | pbcopy
     else
@@ -174,10 +75,10 @@ set_clipboard() {{
             echo "Warning: No clipboard tool found. Please install xclip or xsel on Linux."
         fi
     fi
-}}
+}
 
 # Function to send keystrokes (platform-specific)
-send_keystrokes() {{
+send_keystrokes() {
     if [[ "$PLATFORM" == "Darwin" ]]; then
         # macOS: Use osascript for automation
         osascript -e 'tell application "System Events" to keystroke "v" using command down'
@@ -194,10 +95,10 @@ send_keystrokes() {{
             echo "Please install xdotool for full automation support."
         fi
     fi
-}}
+}
 
 # Function to type text (platform-specific)
-type_text() {{
+type_text() {
     if [[ "$PLATFORM" == "Darwin" ]]; then
         osascript -e "tell application \\"System Events\\" to keystroke \\"$1\\""
     else
@@ -205,7 +106,7 @@ type_text() {{
             xdotool type --window $(xdotool search --pid $2 | head -1) "$1" 2>/dev/null || true
         fi
     fi
-}}
+}
 
 # Try to resume session
 echo "Attempting to resume Claude Code session..."
@@ -217,7 +118,7 @@ if claude --resume --dangerously-skip-permissions 2>&1 | grep -q "Select a sessi
     sleep 2
     
     # Insert coderun.md content
-    set_clipboard '{coderun_content}'
+    set_clipboard '${coderun}'
     send_keystrokes $CLAUDE_PID
 else
     echo "No session to resume, starting new session..."
@@ -238,16 +139,16 @@ else
     sleep 2
     
     # Insert coderun_init.md content
-    set_clipboard '{init_content}'
+    set_clipboard '${init}'
     send_keystrokes $CLAUDE_PID
     sleep 2
     
     # Insert coderun.md content
-    set_clipboard '{coderun_content}'
+    set_clipboard '${coderun}'
     send_keystrokes $CLAUDE_PID
 fi
 
-echo "Claude Code automation completed for {directory.name}"
+echo "Claude Code automation completed for ${dir_name}"
 echo ""
 echo "Note: If automation didn't work properly, you can manually:"
 echo "1. Run 'claude --resume --dangerously-skip-permissions' or 'claude --dangerously-skip-permissions'"
@@ -256,14 +157,194 @@ echo ""
 
 # Keep terminal open
 exec bash
-"""
+""")
+
+@functools.lru_cache(maxsize=None)
+def _detect_platform() -> str:
+    """Detect the current platform once per process from sys.platform and /proc/version"""
+    if sys.platform == "darwin":
+        return "macos"
+    elif sys.platform.startswith("linux"):
+        try:
+            with open("/proc/version", "rb") as f:
+                return "wsl" if b"microsoft" in f.read().lower() else "linux"
+        except OSError:
+            return "linux"
+    else:
+        raise RuntimeError(f"Unsupported platform: {sys.platform}")
+
+
+class _Lazy:
+    """Defers building a log message until a handler actually formats it"""
+    
+    __slots__ = ("func",)
+    
+    def __init__(self, func):
+        self.func = func
+    
+    def __str__(self) -> str:
+        return self.func()
+
+
+def _wsl_to_win(path: str, distro: str) -> str:
+    """
+    Translate a WSL path to its Windows form without spawning wslpath
+    
+    Args:
+        path: Absolute path inside WSL
+        distro: WSL distribution name, used for paths outside /mnt/<drive>
+        
+    Returns:
+        Windows path, e.g. /mnt/c/foo -> C:\\foo, /home/x -> \\\\wsl$\\Ubuntu\\home\\x
+    """
+    if path.startswith('/mnt/') and path[5:6].isalpha() and path[6:7] in ('', '/'):
+        return path[5].upper() + ':\\' + path[7:].replace('/', '\\')
+    return '\\\\wsl$\\' + distro + path.replace('/', '\\')
+
+
+class ClaudeCodeRunner:
+    """Main class for automating Claude Code terminals"""
+    
+    def __init__(self, base_dir: str, coderun_file: str = "coderun.md", 
+                 init_file: str = "coderun_init.md", delay: int = 2,
+                 wsl_distro: str = "Ubuntu", max_parallel: int = 4):
+        """
+        Initialize the ClaudeCodeRunner
+        
+        Args:
+            base_dir: Base directory to scan for subdirectories
+            coderun_file: Main instruction file
+            init_file: Initialization instruction file
+            delay: Delay between launching terminals
+            wsl_distro: WSL distribution name (default: Ubuntu)
+            max_parallel: Maximum directories prepared concurrently
+        """
+        self.base_dir = Path(base_dir).resolve()
+        self.coderun_file = coderun_file
+        self.init_file = init_file
+        self.delay = delay
+        self.wsl_distro = wsl_distro
+        self.max_parallel = max_parallel
+        self.platform = self._detect_platform()
+        self.terminal_cmd = list(self._get_terminal_command(self.platform, self.wsl_distro))
+        
+        # Invariant command pieces, built once rather than on every launch
+        self._use_wt = self.terminal_cmd[0] == "wt.exe"
+        self._wt_prefix = [self.terminal_cmd[0], "-d"]
+        self._wsl_suffix = ["wsl", "-d", self.wsl_distro]
+        
+        # Earliest time the next terminal may launch, keeping them `delay` seconds apart
+        self._next_launch = 0.0
+        
+        # Spawned launchers, reaped once the summary is printed
+        self._launchers: List[subprocess.Popen] = []
+        
+        # Instruction files are invariant for the whole run, so read them once
+        self._coderun_content = self._read_instruction_file(self.coderun_file)
+        self._init_content = self._read_instruction_file(self.init_file)
+        
+        logger.info(f"Initialized ClaudeCodeRunner for {self.platform} platform")
+        logger.info(f"Base directory: {self.base_dir}")
+    
+    def _detect_platform(self) -> str:
+        """Detect the current platform"""
+        return _detect_platform()
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_terminal_command(platform_name: str, wsl_distro: str) -> Tuple[str, ...]:
+        """
+        Get the appropriate terminal command for the platform
+        
+        Availability is checked with shutil.which() rather than spawning each
+        terminal, and the result is cached across runner instances.
+        """
+        if platform_name == "wsl":
+            # Check for Windows Terminal first
+            if shutil.which("wt.exe"):
+                return ("wt.exe", "-d")
+            # Fallback to cmd.exe
+            return ("cmd.exe", "/c", "start", "cmd.exe", "/k", "wsl", "-d", wsl_distro, "--cd")
+        
+        elif platform_name == "macos":
+            # Use osascript to open Terminal.app
+            return ("osascript", "-e")
+        
+        elif platform_name == "linux":
+            # Try common terminal emulators
+            terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
+            for term in terminals:
+                if shutil.which(term):
+                    if term == "gnome-terminal":
+                        return (term, "--working-directory")
+                    else:
+                        return (term, "--workdir")
+            raise RuntimeError("No supported terminal emulator found")
+    
+    def get_subdirectories(self, exclude: Optional[List[str]] = None) -> List[os.DirEntry]:
+        """
+        Get all subdirectories in the base directory
+        
+        Args:
+            exclude: List of directory names to exclude
+            
+        Returns:
+            List of subdirectory entries, sorted by name
+        """
+        exclude_set = set(exclude or [])
+        entries = []
         
         try:
-            with open(script_path, 'w') as f:
-                f.write(script_content)
+            # scandir exposes cached d_type info, so is_dir() needs no extra stat()
+            with os.scandir(self.base_dir) as it:
+                for entry in it:
+                    if entry.name[0] != '.' and entry.name not in exclude_set \
+                            and entry.is_dir(follow_symlinks=False):
+                        entries.append(entry)
+        except Exception as e:
+            logger.error(f"Error scanning directories: {e}")
+            raise
+        
+        if not entries:
+            return entries
+        
+        entries.sort(key=attrgetter('name'))
+        
+        # One log record for the whole scan rather than one per entry
+        if logger.isEnabledFor(logging.INFO):
+            names = [entry.name for entry in entries]
+            logger.info("Found %d directories: %s", len(names), ", ".join(names))
+        
+        return entries
+    
+    def create_automation_script(self, directory: os.DirEntry) -> Path:
+        """
+        Create a temporary automation script for the directory
+        
+        Args:
+            directory: Target directory
             
-            # Make script executable
-            os.chmod(script_path, 0o755)
+        Returns:
+            Path to the created script
+        """
+        script_name = f"claude_automation_{directory.name}.sh"
+        script_path = Path(directory.path, script_name)
+        
+        # Create the automation script
+        script_content = _SCRIPT_TEMPLATE.safe_substitute(
+            dir_name=directory.name,
+            dir_path=directory.path,
+            coderun=self._coderun_content,
+            init=self._init_content
+        )
+        
+        try:
+            # Create the script executable in one step instead of write + chmod
+            fd = os.open(os.fspath(script_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+            try:
+                os.write(fd, script_content.encode('utf-8'))
+            finally:
+                os.close(fd)
             logger.info(f"Created automation script: {script_path}")
             
         except Exception as e:
@@ -281,9 +362,8 @@ exec bash
                 file_path = Path(filename)
             
             if file_path.exists():
-                with open(file_path, 'r') as f:
-                    content = f.read().replace('\n', '\\n').replace('"', '\\"')
-                    return content
+                content = file_path.read_text(encoding='utf-8')
+                return content.translate(_ESCAPE_TABLE)
             else:
                 logger.warning(f"Instruction file not found: {filename}")
                 return f"# {filename} not found"
@@ -292,7 +372,7 @@ exec bash
             logger.error(f"Error reading instruction file {filename}: {e}")
             return f"# Error reading {filename}"
     
-    def launch_terminal(self, directory: Path) -> bool:
+    async def launch_terminal(self, directory: os.DirEntry) -> bool:
         """
         Launch a terminal for the given directory
         
@@ -305,33 +385,114 @@ exec bash
         try:
             if self.platform == "wsl":
                 # Convert WSL path to Windows path
-                win_path = subprocess.check_output(
-                    ["wslpath", "-w", str(directory)], 
-                    text=True
-                ).strip()
+                win_path = _wsl_to_win(directory.path, self.wsl_distro)
                 
-                if self.terminal_cmd[0] == "wt.exe":
+                if self._use_wt:
                     # Windows Terminal
-                    cmd = [self.terminal_cmd[0], "-d", win_path, "wsl", "-d", self.wsl_distro, 
-                           f"cd '{directory}' && bash"]
+                    cmd = self._wt_prefix + [win_path] + self._wsl_suffix + [f"cd '{directory.path}' && bash"]
                 else:
                     # CMD fallback
-                    cmd = self.terminal_cmd + [str(directory)]                
+                    cmd = self.terminal_cmd + [directory.path]
             elif self.platform == "macos":
                 # macOS Terminal.app via AppleScript
-                script = f'''tell app "Terminal" to do script "cd '{directory}' && bash"'''
+                script = f'''tell app "Terminal" to do script "cd '{directory.path}' && bash"'''
                 cmd = self.terminal_cmd + [script]
                 
             else:  # linux
-                cmd = self.terminal_cmd + [str(directory)]
+                cmd = self.terminal_cmd + [directory.path]
             
-            logger.info(f"Launching terminal with command: {' '.join(map(str, cmd))}")
-            subprocess.Popen(cmd)
+            logger.info("Launching terminal with command: %s", _Lazy(lambda: shlex.join(cmd)))
+            # Don't wait here: some terminals stay in the foreground until their
+            # window closes. A new session keeps them out of the runner's process
+            # group (so Ctrl-C here does not reach them), and Popen, unlike an
+            # asyncio subprocess, leaves them running when the event loop closes.
+            self._launchers.append(subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+            ))
             return True
             
         except Exception as e:
-            logger.error(f"Error launching terminal for {directory}: {e}")
+            logger.error(f"Error launching terminal for {directory.path}: {e}")
+            return False
+    
+    async def _wait_for_launch_slot(self):
+        """Wait until the next launch slot, keeping launches `delay` seconds apart"""
+        now = time.monotonic()
+        wait = self._next_launch - now
+        self._next_launch = max(self._next_launch, now) + self.delay
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _wait_for_launchers(self, grace: float = 1.0):
+        """Reap launchers that exit within a short grace period and leave the rest running"""
+        # Most launchers exit at once; some (e.g. xterm) live until the window is closed
+        deadline = time.monotonic() + grace
+        pending = self._launchers
+        while True:
+            still_running = []
+            for proc in pending:
+                returncode = proc.poll()
+                if returncode is None:
+                    still_running.append(proc)
+                elif returncode != 0:
+                    logger.error(f"Terminal launcher exited with code {returncode}")
+            pending = still_running
+            if not pending or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+        
+        if pending:
+            logger.info(f"Leaving {len(pending)} foreground terminal(s) running")
+        self._launchers.clear()
+    
+    async def _process_one(self, directory: os.DirEntry, semaphore: asyncio.Semaphore) -> bool:
+        """
+        Create the automation script and launch a terminal for one directory
+        
+        Args:
+            directory: Target directory
+            semaphore: Limits how many directories are in flight at once
+            
+        Returns:
+            True if the terminal was launched, False otherwise
+        """
+        try:
+            async with semaphore:
+                # Script writes run on the default executor so they overlap each other
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.create_automation_script, directory)
+            
+            # The slot is released before pacing, and launching does not wait for the terminal
+            await self._wait_for_launch_slot()
+            launched = await self.launch_terminal(directory)
+        except Exception as e:
+            logger.error(f"Error processing {directory.name}: {e}")
+            print(f"{Fore.RED}✗ Error processing {directory.name}: {e}{Style.RESET_ALL}")
             return False
+        
+        if launched:
+            print(f"{Fore.GREEN}✓ Terminal launched for {directory.name}{Style.RESET_ALL}")
+        else:
+            print(f"{Fore.RED}✗ Failed to launch terminal for {directory.name}{Style.RESET_ALL}")
+        return launched
+    
+    async def _launch_all(self, subdirs: List[os.DirEntry]):
+        """Process all directories on one event loop, then reap the terminal launchers"""
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        self._next_launch = time.monotonic()
+        results = await asyncio.gather(*(self._process_one(subdir, semaphore) for subdir in subdirs))
+        
+        self._print_summary(sum(results), len(subdirs))
+        await self._wait_for_launchers()
+    
+    def _print_summary(self, successful: int, total: int):
+        """Print execution summary"""
+        print(f"\n{Fore.GREEN}{'='*50}{Style.RESET_ALL}")
+        print(f"{Fore.GREEN}Completed!{Style.RESET_ALL}")
+        print(f"  Successful: {successful}")
+        print(f"  Failed: {total - successful}")
+        print(f"  Total: {total}")
     
     def run(self, exclude: Optional[List[str]] = None, dry_run: bool = False):
         """
@@ -360,41 +521,9 @@ exec bash
             print(f"\n{Fore.YELLOW}Dry run mode - no terminals will be launched{Style.RESET_ALL}")
             return
         
-        # Process each directory
-        successful = 0
-        failed = 0
-        
-        for i, subdir in enumerate(subdirs, 1):
-            print(f"\n{Fore.BLUE}[{i}/{len(subdirs)}] Processing: {subdir.name}{Style.RESET_ALL}")
-            
-            try:
-                # Create automation script
-                script_path = self.create_automation_script(subdir)
-                
-                # Launch terminal
-                if self.launch_terminal(subdir):
-                    successful += 1
-                    print(f"{Fore.GREEN}✓ Terminal launched for {subdir.name}{Style.RESET_ALL}")
-                else:
-                    failed += 1
-                    print(f"{Fore.RED}✗ Failed to launch terminal for {subdir.name}{Style.RESET_ALL}")
-                
-                # Delay between launches
-                if i < len(subdirs):
-                    print(f"Waiting {self.delay} seconds before next launch...")
-                    time.sleep(self.delay)
-                    
-            except Exception as e:
-                failed += 1
-                logger.error(f"Error processing {subdir.name}: {e}")
-                print(f"{Fore.RED}✗ Error processing {subdir.name}: {e}{Style.RESET_ALL}")
-        
-        # Summary
-        print(f"\n{Fore.GREEN}{'='*50}{Style.RESET_ALL}")
-        print(f"{Fore.GREEN}Completed!{Style.RESET_ALL}")
-        print(f"  Successful: {successful}")
-        print(f"  Failed: {failed}")
-        print(f"  Total: {len(subdirs)}")
+        # Process directories concurrently; launches stay staggered by `delay`
+        print(f"\nLaunching terminals {self.delay} seconds apart...")
+        asyncio.run(self._launch_all(subdirs))
 
 
 def main():
@@ -435,6 +564,13 @@ Examples:
         help="Delay in seconds between launching terminals (default: 2)"
     )
     
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=4,
+        help="Maximum directories prepared concurrently (default: 4)"
+    )
+    
     parser.add_argument(
         "--wsl-distro",
         default="Ubuntu",
@@ -467,24 +603,27 @@ Examples:
     # Parse exclude list
     exclude = args.exclude.split(',') if args.exclude else []
     
-    # Validate base directory
-    base_dir = Path(args.base_dir)
-    if not base_dir.exists():
+    # Validate base directory with a single stat() call
+    base_dir = args.base_dir
+    try:
+        st = os.stat(base_dir)
+    except OSError:
         print(f"{Fore.RED}Error: Base directory does not exist: {base_dir}{Style.RESET_ALL}")
         sys.exit(1)
     
-    if not base_dir.is_dir():
+    if not stat.S_ISDIR(st.st_mode):
         print(f"{Fore.RED}Error: Path is not a directory: {base_dir}{Style.RESET_ALL}")
         sys.exit(1)
     
     try:
         # Create and run the automation
         runner = ClaudeCodeRunner(
-            base_dir=str(base_dir),
+            base_dir=base_dir,
             coderun_file=args.coderun,
             init_file=args.init,
             delay=args.delay,
-            wsl_distro=args.wsl_distro
+            wsl_distro=args.wsl_distro,
+            max_parallel=args.max_parallel
         )
         
         runner.run(exclude=exclude, dry_run=args.dry_run)
@@ -8,18 +8,28 @@ import os
 import sys
 import time
 import platform
+import shutil
 import subprocess
+import tempfile
 import argparse
+import atexit
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 import json
-import threading
 import queue
+import asyncio
+from operator import attrgetter
+
+# Platform is fixed for the life of the process, so detect it once at import
+_SYSTEM = platform.system().lower()
+_IS_WSL = _SYSTEM == "linux" and "microsoft" in platform.uname().release.lower()
+_PLATFORM = "wsl" if _IS_WSL else "macos" if _SYSTEM == "darwin" else _SYSTEM
 
 # Platform-specific imports
 try:
-    if platform.system().lower() != "windows":
+    if _SYSTEM != "windows":
         import pexpect
     else:
         pexpect = None
@@ -38,16 +48,22 @@ except ImportError:
     class Style:
         BRIGHT = DIM = RESET_ALL = ''
 
-# Configure logging
+# Configure logging: the QueueHandler formats each record once, then a
+# background QueueListener writes the preformatted line to file and console
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    handlers=[
-        logging.FileHandler('claudecoderun_enhanced.log'),
-        logging.StreamHandler()
-    ]
-)
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_sinks = [
+    logging.FileHandler('claudecoderun_enhanced.log'),
+    logging.StreamHandler()
+]
+for _sink in _log_sinks:
+    _sink.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_sinks)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 
@@ -58,21 +74,28 @@ class TerminalLauncher:
         self.platform = platform_name
         self.wsl_distro = wsl_distro
         self.terminal_cmds = self._get_terminal_commands()
+        self._cmd_cache: Dict[str, bool] = {}
+        self._launchers: List[subprocess.Popen] = []
         self._check_required_tools()
+        
+        # Choose the terminal once rather than probing on every launch
+        self._terminal = self._choose_terminal()
     
     def _get_terminal_commands(self) -> Dict[str, Any]:
         """Get terminal commands for each platform"""
+        # The script is executable and starts with a shebang, so it is run
+        # directly: the pexpect variant is Python and must not go through bash
         commands = {
             "wsl": {
-                "wt": ["wt.exe", "-d", "{path}", "wsl", "-d", self.wsl_distro, "--cd", "{wsl_path}", "--", "bash", "-c", "{script}"],
-                "cmd": ["cmd.exe", "/c", "start", "cmd.exe", "/k", "wsl", "-d", self.wsl_distro, "--cd", "{wsl_path}", "--", "bash", "{script}"]
+                "wt": ["wt.exe", "-d", "{path}", "wsl", "-d", self.wsl_distro, "--cd", "{wsl_path}", "--", "{script}", "{wsl_path}"],
+                "cmd": ["cmd.exe", "/c", "start", "cmd.exe", "/k", "wsl", "-d", self.wsl_distro, "--cd", "{wsl_path}", "--", "{script}", "{wsl_path}"]
             },
             "macos": {
                 "terminal": {
                     "type": "applescript",
                     "script": '''
                     tell application "Terminal"
-                        do script "cd '{path}' && bash '{script}'"
+                        do script "cd '{path}' && '{script}' '{path}'"
                         activate
                     end tell
                     '''
@@ -83,30 +106,43 @@ class TerminalLauncher:
                     tell application "iTerm"
                         create window with default profile
                         tell current session of current window
-                            write text "cd '{path}' && bash '{script}'"
+                            write text "cd '{path}' && '{script}' '{path}'"
                         end tell
                     end tell
                     '''
                 }
             },
             "linux": {
-                "gnome-terminal": ["gnome-terminal", "--working-directory={path}", "--", "bash", "{script}"],
-                "konsole": ["konsole", "--workdir", "{path}", "-e", "bash", "{script}"],
-                "xterm": ["xterm", "-e", "cd '{path}' && bash '{script}'"],
-                "terminator": ["terminator", "--working-directory={path}", "-e", "bash '{script}'"]
+                "gnome-terminal": ["gnome-terminal", "--working-directory={path}", "--", "{script}", "{path}"],
+                "konsole": ["konsole", "--workdir", "{path}", "-e", "{script}", "{path}"],
+                "xterm": ["xterm", "-e", "cd '{path}' && '{script}' '{path}'"],
+                "terminator": ["terminator", "--working-directory={path}", "-e", "'{script}' '{path}'"]
             }
         }
         return commands.get(self.platform, {})
     
-    def launch(self, directory: Path, script_path: Path) -> bool:
+    def precompute_wsl_paths(self, dirs: List[Path]) -> Dict[Path, str]:
+        """Translate directories to Windows paths with a single batched wslpath run"""
+        if not dirs:
+            return {}
+        
+        # One shell reads every path from stdin; failures echo a blank line to keep alignment
+        result = subprocess.run(
+            ["bash", "-c", 'while IFS= read -r p; do wslpath -w "$p" 2>/dev/null || echo; done'],
+            input="\n".join(map(str, dirs)) + "\n", capture_output=True, text=True, check=True
+        )
+        win_paths = result.stdout.splitlines()
+        return {d: w for d, w in zip(dirs, win_paths) if w}
+    
+    async def launch(self, directory: Path, script_path: Path, win_path: Optional[str] = None) -> bool:
         """Launch terminal with script"""
         try:
             if self.platform == "wsl":
-                return self._launch_wsl(directory, script_path)
+                return await self._launch_wsl(directory, script_path, win_path)
             elif self.platform == "macos":
-                return self._launch_macos(directory, script_path)
+                return await self._launch_macos(directory, script_path)
             elif self.platform == "linux":
-                return self._launch_linux(directory, script_path)
+                return await self._launch_linux(directory, script_path)
             else:
                 logger.error(f"Unsupported platform: {self.platform}")
                 return False
@@ -114,73 +150,112 @@ class TerminalLauncher:
             logger.error(f"Error launching terminal: {e}")
             return False
     
-    def _launch_wsl(self, directory: Path, script_path: Path) -> bool:
+    async def _launch_wsl(self, directory: Path, script_path: Path, win_path: Optional[str] = None) -> bool:
         """Launch terminal on WSL"""
         try:
-            # Convert paths
-            win_path = subprocess.check_output(
-                ["wslpath", "-w", str(directory)], text=True
-            ).strip()
+            # Convert paths, unless already translated by precompute_wsl_paths
+            if win_path is None:
+                proc = await asyncio.create_subprocess_exec(
+                    "wslpath", "-w", str(directory), stdout=subprocess.PIPE
+                )
+                stdout, _ = await proc.communicate()
+                if proc.returncode:
+                    raise subprocess.CalledProcessError(proc.returncode, "wslpath")
+                win_path = stdout.decode().strip()
             wsl_path = str(directory)
             
-            # Try Windows Terminal first
-            if self._check_command_exists("wt.exe"):
-                cmd = self.terminal_cmds["wt"]
-                cmd = [c.format(path=win_path, wsl_path=wsl_path, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
-                return True
-            else:
-                # Fallback to cmd
-                cmd = self.terminal_cmds["cmd"]
-                cmd = [c.format(path=win_path, wsl_path=wsl_path, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
-                return True
+            # Windows Terminal, or cmd as the fallback
+            cmd = self.terminal_cmds[self._terminal]
+            cmd = [c.format(path=win_path, wsl_path=wsl_path, script=script_path) for c in cmd]
+            await self._spawn(cmd)
+            return True
                 
         except Exception as e:
             logger.error(f"WSL launch error: {e}")
-            return False    
-    def _launch_macos(self, directory: Path, script_path: Path) -> bool:
+            return False
+    
+    async def _launch_macos(self, directory: Path, script_path: Path) -> bool:
         """Launch terminal on macOS"""
         try:
-            # Try iTerm first if available
+            # iTerm vs Terminal was decided once at init
             if self._check_command_exists("osascript"):
-                if subprocess.run(["osascript", "-e", 'tell application "System Events" to get name of every process'], 
-                                capture_output=True, text=True).stdout.find("iTerm") != -1:
-                    terminal_type = "iterm"
-                else:
-                    terminal_type = "terminal"
-                
-                script_template = self.terminal_cmds[terminal_type]["script"]
+                script_template = self.terminal_cmds[self._terminal]["script"]
                 script = script_template.format(path=directory, script=script_path)
                 
-                subprocess.run(["osascript", "-e", script])
+                # osascript returns once the window is open, so wait for it directly
+                proc = await asyncio.create_subprocess_exec("osascript", "-e", script)
+                await proc.wait()
                 return True
                 
         except Exception as e:
             logger.error(f"macOS launch error: {e}")
             return False
     
-    def _launch_linux(self, directory: Path, script_path: Path) -> bool:
+    async def _launch_linux(self, directory: Path, script_path: Path) -> bool:
         """Launch terminal on Linux"""
-        terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
-        
-        for term in terminals:
-            if self._check_command_exists(term):
-                cmd = self.terminal_cmds[term]
-                cmd = [c.format(path=directory, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
-                return True
+        if self._terminal is None:
+            logger.error("No supported terminal found on Linux")
+            return False
         
-        logger.error("No supported terminal found on Linux")
-        return False
+        cmd = self.terminal_cmds[self._terminal]
+        cmd = [c.format(path=directory, script=script_path) for c in cmd]
+        await self._spawn(cmd)
+        return True
+    
+    async def _spawn(self, cmd: List[str]):
+        """Start a terminal launcher in its own session and track it for wait_for_launchers"""
+        # A new session keeps the terminal out of the runner's process group, so
+        # Ctrl-C in the runner does not reach it; Popen (unlike an asyncio
+        # subprocess) also leaves it running when the event loop closes
+        self._launchers.append(subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        ))
+    
+    async def wait_for_launchers(self, grace: float = 1.0):
+        """Reap launchers that exit within a short grace period and leave the rest running"""
+        # Most launchers hand off to the terminal and exit at once; some
+        # (e.g. xterm) stay in the foreground until their window is closed
+        deadline = time.monotonic() + grace
+        pending = self._launchers
+        while True:
+            pending = [proc for proc in pending if proc.poll() is None]
+            if not pending or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+        
+        if pending:
+            logger.info(f"Leaving {len(pending)} foreground terminal(s) running")
+        self._launchers.clear()
     
     def _check_command_exists(self, command: str) -> bool:
-        """Check if a command exists"""
-        try:
-            subprocess.run([command, "--version"], capture_output=True, check=True)
-            return True
-        except:
-            return False
+        """Check if a command exists on PATH (cached per launcher)"""
+        if command not in self._cmd_cache:
+            self._cmd_cache[command] = shutil.which(command) is not None
+        return self._cmd_cache[command]
+    
+    def _choose_terminal(self) -> Optional[str]:
+        """Pick the terminal_cmds key used for every launch on this platform"""
+        if self.platform == "wsl":
+            # Try Windows Terminal first
+            return "wt" if self._check_command_exists("wt.exe") else "cmd"
+        elif self.platform == "macos":
+            return self._detect_mac_terminal()
+        elif self.platform == "linux":
+            terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
+            return next((t for t in terminals if self._check_command_exists(t)), None)
+        return None
+    
+    def _detect_mac_terminal(self) -> str:
+        """Pick iTerm if it is running, otherwise Terminal.app"""
+        if not self._check_command_exists("osascript"):
+            return "terminal"
+        
+        # Try iTerm first if available
+        processes = subprocess.run(
+            ["osascript", "-e", 'tell application "System Events" to get name of every process'],
+            capture_output=True, text=True
+        ).stdout
+        return "iterm" if "iTerm" in processes else "terminal"
     
     def _check_required_tools(self):
         """Check for platform-specific required tools and warn if missing"""
@@ -219,117 +294,139 @@ class TerminalLauncher:
 
 
 class ClaudeAutomation:
-    """Handle Claude Code automation using pexpect or subprocess"""
+    """Generate the shared Claude Code automation script (pexpect or basic)"""
     
-    def __init__(self, directory: Path, coderun_content: str, init_content: str):
-        self.directory = directory
-        self.coderun_content = coderun_content
-        self.init_content = init_content
-        self.use_pexpect = pexpect is not None and platform.system().lower() != "windows"
+    def __init__(self, coderun_path: Path, init_path: Path):
+        self.coderun_path = coderun_path
+        self.init_path = init_path
+        self.use_pexpect = pexpect is not None and _SYSTEM != "windows"
     
-    def create_script(self) -> Path:
-        """Create automation script"""
-        script_name = f"claude_auto_{self.directory.name}.sh"
-        script_path = self.directory / script_name
+    def create_script(self, script_dir: Path) -> Path:
+        """Create the automation script; it takes the target directory as its first argument"""
+        script_path = script_dir / "claude_auto.sh"
         
         if self.use_pexpect:
             script_content = self._create_pexpect_script()
         else:
             script_content = self._create_basic_script()
         
-        with open(script_path, 'w') as f:
-            f.write(script_content)
+        # Create the file executable up front instead of write + chmod
+        fd = os.open(script_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o755)
+        try:
+            os.write(fd, script_content.encode('utf-8'))
+        finally:
+            os.close(fd)
         
-        os.chmod(script_path, 0o755)
         logger.info(f"Created automation script: {script_path}")
         return script_path
     
     def _create_pexpect_script(self) -> str:
         """Create script using pexpect for better automation"""
         return f'''#!/usr/bin/env python3
+import asyncio
 import pexpect
 import sys
 import time
 import os
 
-os.chdir("{self.directory}")
-print(f"Working in: {self.directory}")
+CODERUN_FILE = {str(self.coderun_path)!r}
+INIT_FILE = {str(self.init_path)!r}
 
-# Try to resume session
-print("Attempting to resume Claude Code session...")
-child = pexpect.spawn("claude --resume --dangerously-skip-permissions", timeout=30)
-child.logfile_read = sys.stdout.buffer
+# Prompt markers matched literally; a timeout falls through rather than aborting
+PROMPTS = ["> ", "$ ", pexpect.TIMEOUT]
 
-try:
-    index = child.expect(["Select a session", "No sessions found", pexpect.EOF], timeout=5)
-    
-    if index == 0:  # Session found
-        print("\\nSession found, selecting most recent...")
-        child.sendline("")  # Select first/most recent
-        child.expect([".*>", ".*$"], timeout=10)
-        
-        # Send coderun content
-        print("\\nSending main instructions...")
-        child.sendline("""{self.coderun_content}""")
-        
-    else:  # No session, start new
-        print("\\nNo session to resume, starting new...")
-        child = pexpect.spawn("claude --dangerously-skip-permissions", timeout=30)
-        child.logfile_read = sys.stdout.buffer
-        
-        # Wait for main prompt
-        child.expect([".*>", ".*$"], timeout=10)
-        
-        # Send /init
-        print("\\nSending /init command...")
-        child.sendline("/init")
-        child.expect([".*>", ".*$"], timeout=10)
-        
-        # Send init content
-        print("\\nSending initialization instructions...")
-        child.sendline("""{self.init_content}""")
-        child.expect([".*>", ".*$"], timeout=10)
-        
-        # Send main content
-        print("\\nSending main instructions...")
-        child.sendline("""{self.coderun_content}""")
-    
-    # Keep interactive
-    print("\\nClaude Code is ready. Switching to interactive mode...")
-    child.interact()
-    
-except Exception as e:
-    print(f"\\nError: {{e}}")
-    child.close()
-    sys.exit(1)
+def read_instructions(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+def send_line(child, text):
+    # Async expects leave the pty non-blocking, where a large write can be
+    # cut short; restore blocking mode and make sure all of it went out
+    os.set_blocking(child.child_fd, True)
+    data = text + child.linesep
+    sent = child.send(data)
+    if sent != len(data.encode("utf-8")):
+        raise IOError(f"short write to claude: {{sent}} of {{len(data.encode('utf-8'))}} bytes")
+
+def spawn(command):
+    # A bounded search window keeps each read from re-scanning the whole buffer
+    child = pexpect.spawn(command, timeout=30, encoding="utf-8",
+                          maxread=4096, searchwindowsize=256)
+    child.logfile_read = sys.stdout
+    return child
+
+os.chdir(sys.argv[1])
+print(f"Working in: {{os.getcwd()}}")
+
+async def main():
+    # Try to resume session
+    print("Attempting to resume Claude Code session...")
+    child = spawn("claude --resume --dangerously-skip-permissions")
+    
+    try:
+        index = await child.expect_exact(["Select a session", "No sessions found", pexpect.EOF],
+                                         timeout=5, async_=True)
+        
+        if index == 0:  # Session found
+            print("\\nSession found, selecting most recent...")
+            send_line(child, "")  # Select first/most recent
+            await child.expect_exact(PROMPTS, timeout=10, async_=True)
+            
+            # Send coderun content
+            print("\\nSending main instructions...")
+            send_line(child, read_instructions(CODERUN_FILE))
+            
+        else:  # No session, start new
+            print("\\nNo session to resume, starting new...")
+            child.close(force=True)
+            child = spawn("claude --dangerously-skip-permissions")
+            
+            # Wait for main prompt
+            await child.expect_exact(PROMPTS, timeout=10, async_=True)
+            
+            # Send /init
+            print("\\nSending /init command...")
+            send_line(child, "/init")
+            await child.expect_exact(PROMPTS, timeout=10, async_=True)
+            
+            # Send init content
+            print("\\nSending initialization instructions...")
+            send_line(child, read_instructions(INIT_FILE))
+            await child.expect_exact(PROMPTS, timeout=10, async_=True)
+            
+            # Send main content
+            print("\\nSending main instructions...")
+            send_line(child, read_instructions(CODERUN_FILE))
+        
+        # Keep interactive
+        print("\\nClaude Code is ready. Switching to interactive mode...")
+        # interact() echoes output itself and passes raw bytes to the log
+        child.logfile_read = None
+        os.set_blocking(child.child_fd, True)
+        child.interact()
+        
+    except Exception as e:
+        print(f"\\nError: {{e}}")
+        sys.exit(1)
+    finally:
+        child.close(force=True)
+
+asyncio.run(main())
 '''    
     def _create_basic_script(self) -> str:
         """Create basic script for platforms without pexpect"""
         return f'''#!/bin/bash
 # Claude Code Automation Script
-# Directory: {self.directory.name}
+# Usage: claude_auto.sh <directory>
 
 set -e
-cd "{self.directory}"
+DIR="${{1:?usage: $0 <directory>}}"
+cd "$DIR"
 echo "Working in: $(pwd)"
 
-# Create temporary files for instructions
-CODERUN_FILE=$(mktemp)
-INIT_FILE=$(mktemp)
-
-cat > "$CODERUN_FILE" << 'EOF'
-{self.coderun_content}
-EOF
-
-cat > "$INIT_FILE" << 'EOF'
-{self.init_content}
-EOF
-
-# Function to cleanup
-cleanup() {{
-    rm -f "$CODERUN_FILE" "$INIT_FILE"
-}}
-trap cleanup EXIT
+# Instruction files written once by the runner
+CODERUN_FILE="{self.coderun_path}"
+INIT_FILE="{self.init_path}"
 
 echo "Starting Claude Code automation..."
 
@@ -394,45 +491,56 @@ class ClaudeCodeRunnerEnhanced:
         self.wsl_distro = wsl_distro
         self.platform = self._detect_platform()
         self.launcher = TerminalLauncher(self.platform, wsl_distro)
+        self.win_paths: Dict[Path, str] = {}
+        
+        # Shared launch deadline so concurrent launches stay `delay` seconds apart
+        self._next_launch_time = 0.0
         
         # Read instruction files once
+        self._search_dirs = (self.base_dir, self.base_dir.parent, Path.cwd(), Path(__file__).parent)
         self.coderun_content = self._read_instruction_file(self.coderun_file)
         self.init_content = self._read_instruction_file(self.init_file)
         
+        # Shared automation script, written by _create_work_dir only when launching
+        self.script_path: Optional[Path] = None
+        
         logger.info(f"Enhanced ClaudeCodeRunner initialized")
         logger.info(f"Platform: {self.platform}")
         logger.info(f"Base directory: {self.base_dir}")
     
     def _detect_platform(self) -> str:
         """Detect the current platform"""
-        system = platform.system().lower()
-        if system == "linux" and "microsoft" in platform.uname().release.lower():
-            return "wsl"
-        elif system == "darwin":
-            return "macos"
-        elif system == "linux":
-            return "linux"
-        else:
-            raise RuntimeError(f"Unsupported platform: {system}")
+        if _PLATFORM not in ("wsl", "macos", "linux"):
+            raise RuntimeError(f"Unsupported platform: {_SYSTEM}")
+        return _PLATFORM
+    
+    def _create_work_dir(self):
+        """Write the instruction files and the shared automation script to a temp directory"""
+        # Written once to a shared location that the automation script reads from
+        work_dir = Path(tempfile.mkdtemp(prefix="claudecoderun_"))
+        self.coderun_path = work_dir / "coderun.md"
+        self.init_path = work_dir / "coderun_init.md"
+        self.coderun_path.write_text(self.coderun_content, encoding="utf-8")
+        self.init_path.write_text(self.init_content, encoding="utf-8")
+        
+        # One automation script serves every directory, which is passed as $1
+        self.script_path = ClaudeAutomation(self.coderun_path, self.init_path).create_script(work_dir)
     
     def _read_instruction_file(self, filename: str) -> str:
         """Read instruction file content"""
-        search_paths = [
-            self.base_dir / filename,
-            self.base_dir.parent / filename,
-            Path.cwd() / filename,
-            Path(__file__).parent / filename
-        ]
-        
-        for path in search_paths:
-            if path.exists():
-                try:
-                    with open(path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        logger.info(f"Loaded instruction file: {path}")
-                        return content
-                except Exception as e:
-                    logger.error(f"Error reading {path}: {e}")
+        # Search in the documented order, reading directly instead of probing exists()
+        for directory in self._search_dirs:
+            path = directory / filename
+            try:
+                content = path.read_bytes().decode('utf-8')
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.error(f"Error reading {path}: {e}")
+                continue
+            
+            logger.info(f"Loaded instruction file: {path}")
+            return content
         
         logger.warning(f"Instruction file not found: {filename}")
         return f"# {filename} not found\\n# Please create this file with your instructions"    
@@ -442,33 +550,35 @@ class ClaudeCodeRunnerEnhanced:
         exclude_set = set(exclude)
         exclude_set.add('.git')  # Always exclude .git
         
-        subdirs = []
         try:
-            for item in self.base_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    if item.name not in exclude_set:
-                        subdirs.append(item)
+            # DirEntry.is_dir() uses the d_type from readdir, avoiding a stat() per entry
+            with os.scandir(self.base_dir) as it:
+                entries = [e for e in it
+                           if e.is_dir(follow_symlinks=False)
+                           and not e.name.startswith('.')
+                           and e.name not in exclude_set]
         except Exception as e:
             logger.error(f"Error scanning directories: {e}")
             raise
         
-        return sorted(subdirs)
+        entries.sort(key=attrgetter('name'))
+        return [Path(e.path) for e in entries]
+    
+    async def _wait_for_launch_slot(self):
+        """Wait until this launch is due, pacing launches globally at 1/delay Hz"""
+        now = time.monotonic()
+        wait = max(0.0, self._next_launch_time - now)
+        self._next_launch_time = max(self._next_launch_time, now) + self.delay
+        
+        if wait:
+            await asyncio.sleep(wait)
     
-    def process_directory(self, directory: Path) -> bool:
+    async def process_directory(self, directory: Path) -> bool:
         """Process a single directory"""
         try:
-            # Create automation handler
-            automation = ClaudeAutomation(
-                directory, 
-                self.coderun_content, 
-                self.init_content
-            )
-            
-            # Create script
-            script_path = automation.create_script()
-            
-            # Launch terminal
-            success = self.launcher.launch(directory, script_path)
+            # Launch terminal running the shared script for this directory
+            await self._wait_for_launch_slot()
+            success = await self.launcher.launch(directory, self.script_path, self.win_paths.get(directory))
             
             if success:
                 logger.info(f"Successfully launched terminal for {directory.name}")
@@ -506,31 +616,45 @@ class ClaudeCodeRunnerEnhanced:
             return
         
         print(f"\n{Fore.BLUE}Found {len(subdirs)} directories:{Style.RESET_ALL}")
-        for subdir in subdirs:
-            print(f"  {Fore.BLUE}→{Style.RESET_ALL} {subdir.name}")
+        sys.stdout.write("".join(f"  {Fore.BLUE}→{Style.RESET_ALL} {s.name}\n" for s in subdirs))
         
         if dry_run:
             print(f"\n{Fore.YELLOW}Dry run - no actions will be taken{Style.RESET_ALL}")
             return
         
+        self._create_work_dir()
+        
+        # Translate all WSL paths up front instead of once per launch
+        if self.platform == "wsl":
+            try:
+                self.win_paths = self.launcher.precompute_wsl_paths(subdirs)
+            except (subprocess.SubprocessError, OSError) as e:
+                logger.warning(f"Batch wslpath failed, translating per directory: {e}")
+        
         # Process directories
         print(f"\n{Fore.GREEN}Starting processing...{Style.RESET_ALL}")
         results = {"success": 0, "failed": 0}
         
-        if parallel and len(subdirs) > 1:
-            self._process_parallel(subdirs, results, max_parallel)
+        asyncio.run(self._process_all(subdirs, results, parallel and len(subdirs) > 1, max_parallel))
+    
+    async def _process_all(self, subdirs: List[Path], results: Dict[str, int],
+                           parallel: bool, max_parallel: int):
+        """Process every directory on one event loop, then reap the terminal launchers"""
+        if parallel:
+            await self._process_parallel(subdirs, results, max_parallel)
         else:
-            self._process_sequential(subdirs, results)
+            await self._process_sequential(subdirs, results)
         
         # Summary
         self._print_summary(results, len(subdirs))
+        await self.launcher.wait_for_launchers()
     
-    def _process_sequential(self, subdirs: List[Path], results: Dict[str, int]):
+    async def _process_sequential(self, subdirs: List[Path], results: Dict[str, int]):
         """Process directories sequentially"""
         for i, subdir in enumerate(subdirs, 1):
             print(f"\n{Fore.CYAN}[{i}/{len(subdirs)}] Processing: {subdir.name}{Style.RESET_ALL}")
             
-            if self.process_directory(subdir):
+            if await self.process_directory(subdir):
                 results["success"] += 1
                 print(f"{Fore.GREEN}✓ Success: {subdir.name}{Style.RESET_ALL}")
             else:
@@ -539,63 +663,42 @@ class ClaudeCodeRunnerEnhanced:
             
             if i < len(subdirs):
                 print(f"{Fore.YELLOW}Waiting {self.delay}s...{Style.RESET_ALL}")
-                time.sleep(self.delay)
+                await asyncio.sleep(self.delay)
     
-    def _process_parallel(self, subdirs: List[Path], results: Dict[str, int], 
-                         max_parallel: int):
-        """Process directories in parallel"""
+    async def _process_parallel(self, subdirs: List[Path], results: Dict[str, int], 
+                                max_parallel: int):
+        """Process directories concurrently on the event loop"""
         print(f"{Fore.MAGENTA}Using parallel processing (max {max_parallel}){Style.RESET_ALL}")
+        semaphore = asyncio.Semaphore(max_parallel)
         
-        work_queue = queue.Queue()
-        for subdir in subdirs:
-            work_queue.put(subdir)
-        
-        threads = []
-        lock = threading.Lock()
-        
-        def worker():
-            while True:
-                try:
-                    subdir = work_queue.get(timeout=1)
-                    success = self.process_directory(subdir)
-                    
-                    with lock:
-                        if success:
-                            results["success"] += 1
-                            print(f"{Fore.GREEN}✓ {subdir.name}{Style.RESET_ALL}")
-                        else:
-                            results["failed"] += 1
-                            print(f"{Fore.RED}✗ {subdir.name}{Style.RESET_ALL}")
-                    
-                    work_queue.task_done()
-                    time.sleep(self.delay)
-                    
-                except queue.Empty:
-                    break
-        
-        # Start workers
-        for _ in range(min(max_parallel, len(subdirs))):
-            t = threading.Thread(target=worker)
-            t.daemon = True
-            t.start()
-            threads.append(t)
-        
-        # Wait for completion
-        work_queue.join()
-        for t in threads:
-            t.join()
+        async def process(subdir: Path):
+            async with semaphore:
+                success = await self.process_directory(subdir)
+            
+            # Single-threaded event loop, so results need no lock
+            if success:
+                results["success"] += 1
+                print(f"{Fore.GREEN}✓ {subdir.name}{Style.RESET_ALL}")
+            else:
+                results["failed"] += 1
+                print(f"{Fore.RED}✗ {subdir.name}{Style.RESET_ALL}")
+        
+        await asyncio.gather(*(process(subdir) for subdir in subdirs))
     
     def _print_summary(self, results: Dict[str, int], total: int):
         """Print execution summary"""
-        print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{Style.BRIGHT}Summary:{Style.RESET_ALL}")
-        print(f"  {Fore.GREEN}Successful:{Style.RESET_ALL} {results['success']}")
-        print(f"  {Fore.RED}Failed:{Style.RESET_ALL} {results['failed']}")
-        print(f"  {Fore.BLUE}Total:{Style.RESET_ALL} {total}")
-        
         success_rate = (results['success'] / total * 100) if total > 0 else 0
         color = Fore.GREEN if success_rate >= 80 else Fore.YELLOW if success_rate >= 50 else Fore.RED
-        print(f"  {color}Success Rate:{Style.RESET_ALL} {success_rate:.1f}%")
+        
+        sys.stdout.write(
+            f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}\n"
+            f"{Fore.CYAN}{Style.BRIGHT}Summary:{Style.RESET_ALL}\n"
+            f"  {Fore.GREEN}Successful:{Style.RESET_ALL} {results['success']}\n"
+            f"  {Fore.RED}Failed:{Style.RESET_ALL} {results['failed']}\n"
+            f"  {Fore.BLUE}Total:{Style.RESET_ALL} {total}\n"
+            f"  {color}Success Rate:{Style.RESET_ALL} {success_rate:.1f}%\n"
+        )
+        sys.stdout.flush()
 
 
 def main():
@@ -5,18 +5,24 @@ Automates opening Claude Code in new terminals with stage-specific instructions
 """
 
 import os
+import re
 import sys
 import time
 import platform
+import shutil
 import subprocess
 import argparse
+import functools
+import atexit
+import queue
 import logging
+import logging.handlers
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 import json
-import threading
-import queue
-import glob
+import asyncio
+import fnmatch
 
 # Platform-specific imports
 try:
@@ -39,16 +45,27 @@ except ImportError:
     class Style:
         BRIGHT = DIM = RESET_ALL = ''
 
-# Configure logging
+# Colored prefixes for per-directory progress lines, built once
+_OK = f"{Fore.GREEN}✓ "
+_FAIL = f"{Fore.RED}✗ "
+_RESET = Style.RESET_ALL
+
+# Configure logging: worker threads only enqueue records, and a background
+# QueueListener writes the preformatted line to file and console
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-logging.basicConfig(
-    level=logging.INFO,
-    format=LOG_FORMAT,
-    handlers=[
-        logging.FileHandler('claudecoderun_stage.log'),
-        logging.StreamHandler()
-    ]
-)
+_log_queue = queue.SimpleQueue()
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_log_sinks = [
+    logging.FileHandler('claudecoderun_stage.log'),
+    logging.StreamHandler()
+]
+for _sink in _log_sinks:
+    _sink.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_sinks)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
 
@@ -64,6 +81,41 @@ class StageAwareClaudeRunner:
         self.platform = self._detect_platform()
         self.launcher = TerminalLauncher(self.platform)
         
+        # Shared launch deadline so concurrent launches stay `delay` seconds apart
+        self._next_launch_time = 0.0
+        
+        # Reported under every successful launch when a stage is set
+        self._launched_line = f"{_OK}Launched with stage: {stage_pattern}{_RESET}\n" if stage_pattern else ""
+        
+        # Stage search locations that do not depend on the subdirectory,
+        # deduplicated and pruned to those that exist so misses aren't restated
+        candidates = [
+            self.base_dir,
+            self.base_dir.parent,
+            Path.cwd(),
+            Path(__file__).parent,
+        ] + self.stage_dirs  # Add custom stage directories
+        self._static_search_paths: List[Path] = [p for p in dict.fromkeys(candidates) if p.is_dir()]
+        self._static_init: Optional[Path] = None
+        self._static_continue: Optional[Path] = None
+        self._stage_scanned = False
+        # Instruction files found per directory, shared by every find_instruction_files call
+        self._dir_cache: Dict[Path, Dict[str, Path]] = {}
+        # Final lookup result per directory; depends only on the directory
+        # and this runner's fixed settings, so it is safe to reuse
+        self._resolved: Dict[Path, Tuple[Optional[Path], Optional[Path]]] = {}
+        # Stage patterns compiled once, and only when they are real globs;
+        # literal stage names are resolved by set lookup alone
+        self._init_re = self._continue_re = None
+        if self.stage_pattern and any(c in self.stage_pattern for c in "*?["):
+            self._init_re = re.compile(fnmatch.translate(f"coderun_init_{self.stage_pattern}.md"))
+            self._continue_re = re.compile(fnmatch.translate(f"coderun_continue_{self.stage_pattern}.md"))
+        # Every literal file name a lookup can ask for
+        self._wanted = {"coderun_init.md", "coderun.md"}
+        if self.stage_pattern:
+            self._wanted |= {f"coderun_init_{self.stage_pattern}.md",
+                             f"coderun_continue_{self.stage_pattern}.md"}
+        
         logger.info(f"Stage-aware ClaudeCodeRunner initialized")
         logger.info(f"Platform: {self.platform}")
         logger.info(f"Base directory: {self.base_dir}")
@@ -81,6 +133,67 @@ class StageAwareClaudeRunner:
         else:
             raise RuntimeError(f"Unsupported platform: {system}")
     
+    def _probe(self, search_path: Path) -> Dict[str, Path]:
+        """Return the instruction files in a directory, scanning it only once per run"""
+        found = self._dir_cache.get(search_path)
+        if found is None:
+            found = {}
+            try:
+                # One readdir checks the stage and generic names together
+                with os.scandir(search_path) as it:
+                    for e in it:
+                        if (e.name in self._wanted or
+                                (self._init_re and (self._init_re.match(e.name) or
+                                                    self._continue_re.match(e.name)))):
+                            found[e.name] = Path(e.path)
+            except OSError:
+                pass
+            self._dir_cache[search_path] = found
+        return found
+    
+    def _search_stage_files(self, search_paths: List[Path]) -> Tuple[Optional[Path], Optional[Path]]:
+        """Return the stage files from the first search path holding either"""
+        init_file = None
+        continue_file = None
+        init_pattern = f"coderun_init_{self.stage_pattern}.md"
+        continue_pattern = f"coderun_continue_{self.stage_pattern}.md"
+        
+        for search_path in search_paths:
+            found = self._probe(search_path)
+            if not found:
+                continue
+                
+            # Look for exact matches first
+            if init_pattern in found:
+                init_file = found[init_pattern]
+                logger.info(f"Found init file: {init_file}")
+            
+            if continue_pattern in found:
+                continue_file = found[continue_pattern]
+                logger.info(f"Found continue file: {continue_file}")
+            
+            # If not found and the stage is a wildcard, try glob patterns
+            # (only the first match is used, so stop at it)
+            if not init_file and self._init_re:
+                init_file = next((p for n, p in found.items() if self._init_re.match(n)), None)
+                if init_file:
+                    logger.info(f"Found init file via glob: {init_file}")
+            
+            if not continue_file and self._continue_re:
+                continue_file = next((p for n, p in found.items() if self._continue_re.match(n)), None)
+                if continue_file:
+                    logger.info(f"Found continue file via glob: {continue_file}")
+            
+            if init_file or continue_file:
+                break
+        
+        return init_file, continue_file
+    
+    def _scan_stage_files(self):
+        """Resolve the stage files from the search paths shared by all subdirectories"""
+        self._static_init, self._static_continue = self._search_stage_files(self._static_search_paths)
+        self._stage_scanned = True
+    
     def find_instruction_files(self, directory: Path) -> Tuple[Optional[Path], Optional[Path]]:
         """
         Find instruction files for a directory, supporting wildcards
@@ -88,137 +201,105 @@ class StageAwareClaudeRunner:
         Returns:
             Tuple of (init_file, continue_file)
         """
+        resolved = self._resolved.get(directory)
+        if resolved is not None:
+            return resolved
+        
         init_file = None
         continue_file = None
         
         # If stage pattern provided, look for stage-specific files
         if self.stage_pattern:
-            # Look for stage-specific files
-            init_pattern = f"coderun_init_{self.stage_pattern}.md"
-            continue_pattern = f"coderun_continue_{self.stage_pattern}.md"
-            
-            # Search in multiple locations
-            search_paths = [
-                directory,
-                directory.parent,
-                self.base_dir,
-                self.base_dir.parent,
-                Path.cwd(),
-                Path(__file__).parent,
-            ] + self.stage_dirs  # Add custom stage directories
-            
-            for search_path in search_paths:
-                if not search_path.exists():
-                    continue
-                    
-                # Look for exact matches first
-                init_candidate = search_path / init_pattern
-                continue_candidate = search_path / continue_pattern
-                
-                if init_candidate.exists():
-                    init_file = init_candidate
-                    logger.info(f"Found init file: {init_file}")
-                
-                if continue_candidate.exists():
-                    continue_file = continue_candidate
-                    logger.info(f"Found continue file: {continue_file}")
-                
-                # If not found, try glob patterns
-                if not init_file:
-                    init_matches = list(search_path.glob(init_pattern))
-                    if init_matches:
-                        init_file = init_matches[0]
-                        logger.info(f"Found init file via glob: {init_file}")
-                
-                if not continue_file:
-                    continue_matches = list(search_path.glob(continue_pattern))
-                    if continue_matches:
-                        continue_file = continue_matches[0]
-                        logger.info(f"Found continue file via glob: {continue_file}")
-                
-                if init_file or continue_file:
-                    break
+            # Only the directory and its parent vary per subdirectory; the
+            # remaining locations were resolved once by _scan_stage_files
+            init_file, continue_file = self._search_stage_files([directory, directory.parent])
+            if not init_file and not continue_file:
+                if not self._stage_scanned:
+                    self._scan_stage_files()
+                init_file, continue_file = self._static_init, self._static_continue
         
         # Fallback to generic files if no stage-specific found
         if not init_file and not continue_file:
             for filename in ["coderun_init.md", "coderun.md"]:
                 for search_path in [directory, directory.parent, self.base_dir, Path.cwd()]:
-                    candidate = search_path / filename
-                    if candidate.exists():
-                        init_file = candidate
+                    init_file = self._probe(search_path).get(filename)
+                    if init_file:
                         logger.info(f"Using generic file: {init_file}")
                         break
                 if init_file:
                     break
         
+        self._resolved[directory] = (init_file, continue_file)
         return init_file, continue_file
     
-    def read_instruction_file(self, file_path: Path) -> str:
-        """Read and return instruction file content"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                logger.info(f"Successfully read {file_path}")
-                return content
-        except Exception as e:
-            logger.error(f"Error reading {file_path}: {e}")
-            return f"# Error reading {file_path}\n{str(e)}"
-    
     def get_subdirectories(self, exclude: Optional[List[str]] = None) -> List[Path]:
         """Get all subdirectories"""
         exclude = exclude or []
         exclude_set = set(exclude)
         exclude_set.add('.git')  # Always exclude .git
         
-        subdirs = []
         try:
-            for item in self.base_dir.iterdir():
-                if item.is_dir() and not item.name.startswith('.'):
-                    if item.name not in exclude_set:
-                        subdirs.append(item)
+            # DirEntry.is_dir uses the type from readdir, avoiding a stat per child
+            with os.scandir(self.base_dir) as it:
+                subdirs = [Path(e.path) for e in it
+                           if e.is_dir(follow_symlinks=False)
+                           and not e.name.startswith('.')
+                           and e.name not in exclude_set]
         except Exception as e:
             logger.error(f"Error scanning directories: {e}")
             raise
         
-        return sorted(subdirs)
+        subdirs.sort(key=attrgetter('name'))
+        return subdirs
+    
+    def _prepare_directory(self, directory: Path) -> Optional[Path]:
+        """Write the automation script for a directory, or return None if it has no instructions"""
+        # Find appropriate instruction files
+        init_file, continue_file = self.find_instruction_files(directory)
+        
+        if not init_file and not continue_file:
+            logger.warning(f"No instruction files found for {directory}")
+            return None
+        
+        # Determine which file to use
+        # If we have a continue file, check if we should use it
+        # For now, we'll use init for first run, continue for subsequent
+        # This could be enhanced to detect actual session state
+        # The script reads the files itself, so nothing is loaded here
+        automation = ClaudeAutomation(
+            directory, 
+            init_file or continue_file,
+            continue_file or init_file
+        )
+        
+        # Create script
+        return automation.create_script()
+    
+    async def _wait_for_launch_slot(self):
+        """Wait until this launch is due, pacing launches globally at 1/delay Hz"""
+        now = time.monotonic()
+        wait = max(0.0, self._next_launch_time - now)
+        self._next_launch_time = max(self._next_launch_time, now) + self.delay
+        
+        if wait:
+            await asyncio.sleep(wait)
     
-    def process_directory(self, directory: Path) -> bool:
+    async def process_directory(self, directory: Path) -> bool:
         """Process a single directory with stage awareness"""
         try:
-            # Find appropriate instruction files
-            init_file, continue_file = self.find_instruction_files(directory)
-            
-            if not init_file and not continue_file:
-                logger.warning(f"No instruction files found for {directory}")
+            # File lookup and script write are blocking I/O, so they run in the
+            # default executor and overlap with other directories' launches
+            loop = asyncio.get_running_loop()
+            script_path = await loop.run_in_executor(None, self._prepare_directory, directory)
+            if script_path is None:
                 return False
             
-            # Read instruction content
-            init_content = self.read_instruction_file(init_file) if init_file else ""
-            continue_content = self.read_instruction_file(continue_file) if continue_file else ""
-            
-            # Determine which content to use
-            # If we have a continue file, check if we should use it
-            # For now, we'll use init for first run, continue for subsequent
-            # This could be enhanced to detect actual session state
-            primary_content = init_content if init_content else continue_content
-            
-            # Create automation handler
-            automation = ClaudeAutomation(
-                directory, 
-                primary_content,
-                continue_content if continue_content else init_content
-            )
-            
-            # Create script
-            script_path = automation.create_script()
-            
             # Launch terminal
-            success = self.launcher.launch(directory, script_path)
+            await self._wait_for_launch_slot()
+            success = await self.launcher.launch(directory, script_path)
             
             if success:
                 logger.info(f"Successfully launched terminal for {directory.name}")
-                if self.stage_pattern:
-                    print(f"{Fore.GREEN}✓ Launched with stage: {self.stage_pattern}{Style.RESET_ALL}")
             else:
                 logger.error(f"Failed to launch terminal for {directory.name}")
             
@@ -226,9 +307,10 @@ class StageAwareClaudeRunner:
             
         except Exception as e:
             logger.error(f"Error processing {directory.name}: {e}")
-            return False    
+            return False
+    
     def run(self, exclude: Optional[List[str]] = None, dry_run: bool = False,
-            parallel: bool = False, max_parallel: int = 3):
+            parallel: bool = False, max_parallel: int = 3, batch: bool = False):
         """Run the automation with stage support"""
         print(f"\n{Fore.CYAN}{Style.BRIGHT}Claude Code Runner - Stage Aware{Style.RESET_ALL}")
         print(f"{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
@@ -241,119 +323,175 @@ class StageAwareClaudeRunner:
         # Get subdirectories
         subdirs = self.get_subdirectories(exclude)
         
+        if self.stage_pattern:
+            self._scan_stage_files()
+        
         if not subdirs:
             print(f"\n{Fore.YELLOW}No subdirectories found{Style.RESET_ALL}")
             return
         
         print(f"\n{Fore.BLUE}Found {len(subdirs)} directories:{Style.RESET_ALL}")
-        for subdir in subdirs:
-            print(f"  {Fore.BLUE}→{Style.RESET_ALL} {subdir.name}")
+        sys.stdout.write("".join(f"  {Fore.BLUE}→{Style.RESET_ALL} {s.name}\n" for s in subdirs))
         
         if dry_run:
             print(f"\n{Fore.YELLOW}Dry run - no actions will be taken{Style.RESET_ALL}")
             
             # Show what files would be used
+            buf = []
             for subdir in subdirs:
                 init_file, continue_file = self.find_instruction_files(subdir)
-                print(f"\n{subdir.name}:")
+                buf.append(f"\n{subdir.name}:\n")
                 if init_file:
-                    print(f"  Init: {init_file}")
+                    buf.append(f"  Init: {init_file}\n")
                 if continue_file:
-                    print(f"  Continue: {continue_file}")
+                    buf.append(f"  Continue: {continue_file}\n")
+            sys.stdout.write("".join(buf))
             return
         
         # Process directories
         print(f"\n{Fore.GREEN}Starting processing...{Style.RESET_ALL}")
         results = {"success": 0, "failed": 0}
         
-        if parallel and len(subdirs) > 1:
-            self._process_parallel(subdirs, results, max_parallel)
+        asyncio.run(self._process_all(subdirs, results, batch and len(subdirs) > 1,
+                                      parallel and len(subdirs) > 1, max_parallel))
+    
+    async def _process_all(self, subdirs: List[Path], results: Dict[str, int],
+                           batch: bool, parallel: bool, max_parallel: int):
+        """Process every directory on one event loop, then reap the terminal launchers"""
+        if batch:
+            await self._process_batch(subdirs, results)
+        elif parallel:
+            await self._process_parallel(subdirs, results, max_parallel)
         else:
-            self._process_sequential(subdirs, results)
+            await self._process_sequential(subdirs, results)
         
         # Summary
         self._print_summary(results, len(subdirs))
+        await self.launcher.wait_for_launchers()
     
-    def _process_sequential(self, subdirs: List[Path], results: Dict[str, int]):
+    async def _process_sequential(self, subdirs: List[Path], results: Dict[str, int]):
         """Process directories sequentially"""
+        total = len(subdirs)
         for i, subdir in enumerate(subdirs, 1):
-            print(f"\n{Fore.CYAN}[{i}/{len(subdirs)}] Processing: {subdir.name}{Style.RESET_ALL}")
+            sys.stdout.write(f"\n{Fore.CYAN}[{i}/{total}] Processing: {subdir.name}{_RESET}\n")
+            sys.stdout.flush()
             
-            if self.process_directory(subdir):
+            # Everything reported after the launch goes out in one write
+            if await self.process_directory(subdir):
                 results["success"] += 1
-                print(f"{Fore.GREEN}✓ Success: {subdir.name}{Style.RESET_ALL}")
+                out = f"{self._launched_line}{_OK}Success: {subdir.name}{_RESET}\n"
             else:
                 results["failed"] += 1
-                print(f"{Fore.RED}✗ Failed: {subdir.name}{Style.RESET_ALL}")
+                out = f"{_FAIL}Failed: {subdir.name}{_RESET}\n"
+            
+            if i < total:
+                out += f"{Fore.YELLOW}Waiting {self.delay}s...{_RESET}\n"
+            sys.stdout.write(out)
+            sys.stdout.flush()
             
-            if i < len(subdirs):
-                print(f"{Fore.YELLOW}Waiting {self.delay}s...{Style.RESET_ALL}")
-                time.sleep(self.delay)
+            if i < total:
+                await asyncio.sleep(self.delay)
     
-    def _process_parallel(self, subdirs: List[Path], results: Dict[str, int], 
-                         max_parallel: int):
-        """Process directories in parallel"""
+    async def _process_parallel(self, subdirs: List[Path], results: Dict[str, int], 
+                                max_parallel: int):
+        """Process directories concurrently on the event loop"""
         print(f"{Fore.MAGENTA}Using parallel processing (max {max_parallel}){Style.RESET_ALL}")
+        semaphore = asyncio.Semaphore(max_parallel)
         
-        work_queue = queue.Queue()
-        for subdir in subdirs:
-            work_queue.put(subdir)
-        
-        threads = []
-        lock = threading.Lock()
-        
-        def worker():
-            while True:
-                try:
-                    subdir = work_queue.get(timeout=1)
-                    success = self.process_directory(subdir)
-                    
-                    with lock:
-                        if success:
-                            results["success"] += 1
-                            print(f"{Fore.GREEN}✓ {subdir.name}{Style.RESET_ALL}")
-                        else:
-                            results["failed"] += 1
-                            print(f"{Fore.RED}✗ {subdir.name}{Style.RESET_ALL}")
-                    
-                    work_queue.task_done()
-                    time.sleep(self.delay)
-                    
-                except queue.Empty:
-                    break
+        async def process(subdir: Path):
+            async with semaphore:
+                success = await self.process_directory(subdir)
+            
+            # Single-threaded event loop, so results need no lock
+            if success:
+                results["success"] += 1
+                sys.stdout.write(f"{self._launched_line}{_OK}{subdir.name}{_RESET}\n")
+            else:
+                results["failed"] += 1
+                sys.stdout.write(f"{_FAIL}{subdir.name}{_RESET}\n")
+            sys.stdout.flush()
         
-        # Start workers
-        for _ in range(min(max_parallel, len(subdirs))):
-            t = threading.Thread(target=worker)
-            t.daemon = True
-            t.start()
-            threads.append(t)
+        await asyncio.gather(*(process(subdir) for subdir in subdirs))
+    
+    async def _process_batch(self, subdirs: List[Path], results: Dict[str, int]):
+        """Write every script first, then open all terminals with one launch"""
+        print(f"{Fore.MAGENTA}Launching all terminals in one batch{Style.RESET_ALL}")
+        
+        # Scripts are written concurrently in the default executor
+        loop = asyncio.get_running_loop()
+        prepared = await asyncio.gather(
+            *(loop.run_in_executor(None, self._prepare_directory, subdir) for subdir in subdirs),
+            return_exceptions=True
+        )
+        
+        pairs = []
+        for subdir, script_path in zip(subdirs, prepared):
+            if isinstance(script_path, Exception):
+                logger.error(f"Error processing {subdir.name}: {script_path}")
+                script_path = None
+            if script_path is None:
+                results["failed"] += 1
+                sys.stdout.write(f"{_FAIL}{subdir.name}{_RESET}\n")
+            else:
+                pairs.append((subdir, script_path))
+        
+        if not pairs:
+            return
         
-        # Wait for completion
-        work_queue.join()
-        for t in threads:
-            t.join()
+        ok = await self.launcher.launch_batch(pairs)
+        results["success" if ok else "failed"] += len(pairs)
+        prefix = _OK if ok else _FAIL
+        sys.stdout.write("".join(f"{prefix}{subdir.name}{_RESET}\n" for subdir, _ in pairs))
+        sys.stdout.flush()
     
     def _print_summary(self, results: Dict[str, int], total: int):
         """Print execution summary"""
-        print(f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}{Style.BRIGHT}Summary:{Style.RESET_ALL}")
-        print(f"  {Fore.GREEN}Successful:{Style.RESET_ALL} {results['success']}")
-        print(f"  {Fore.RED}Failed:{Style.RESET_ALL} {results['failed']}")
-        print(f"  {Fore.BLUE}Total:{Style.RESET_ALL} {total}")
-        
         success_rate = (results['success'] / total * 100) if total > 0 else 0
         color = Fore.GREEN if success_rate >= 80 else Fore.YELLOW if success_rate >= 50 else Fore.RED
-        print(f"  {color}Success Rate:{Style.RESET_ALL} {success_rate:.1f}%")
+        
+        sys.stdout.write(
+            f"\n{Fore.CYAN}{'='*50}{Style.RESET_ALL}\n"
+            f"{Fore.CYAN}{Style.BRIGHT}Summary:{Style.RESET_ALL}\n"
+            f"  {Fore.GREEN}Successful:{Style.RESET_ALL} {results['success']}\n"
+            f"  {Fore.RED}Failed:{Style.RESET_ALL} {results['failed']}\n"
+            f"  {Fore.BLUE}Total:{Style.RESET_ALL} {total}\n"
+            f"  {color}Success Rate:{Style.RESET_ALL} {success_rate:.1f}%\n"
+        )
+        sys.stdout.flush()
+
+
+_MNT_DRIVE_RE = re.compile(r'^/mnt/([a-z])(?:/(.*))?$')
+
+
+@functools.lru_cache(maxsize=None)
+def _wslpath_w(p: str) -> Optional[str]:
+    """Convert a /mnt/<drive> path to Windows form, or return None for any other path"""
+    m = _MNT_DRIVE_RE.match(p)
+    if m:
+        return f"{m[1].upper()}:\\{(m[2] or '').replace('/', chr(92))}"
+    return None
 
 
 # Include the TerminalLauncher and ClaudeAutomation classes from the enhanced version
 class TerminalLauncher:
     """Platform-specific terminal launcher"""
     
+    _PROBED_COMMANDS = {
+        "wsl": ("wt.exe",),
+        "macos": ("osascript",),
+        "linux": ("gnome-terminal", "konsole", "xterm", "terminator"),
+    }
+    
     def __init__(self, platform_name: str):
         self.platform = platform_name
         self.terminal_cmds = self._get_terminal_commands()
+        # Resolve every command this platform may need once, via PATH lookup
+        self._available = {name: shutil.which(name)
+                           for name in self._PROBED_COMMANDS.get(platform_name, ())}
+        self._iterm: Optional[bool] = None
+        self._launchers: List[subprocess.Popen] = []
+        # wslpath results for paths outside /mnt/<drive>
+        self._win_paths: Dict[str, str] = {}
     
     def _get_terminal_commands(self) -> Dict[str, Any]:
         """Get terminal commands for each platform"""
@@ -393,15 +531,15 @@ class TerminalLauncher:
         }
         return commands.get(self.platform, {})
     
-    def launch(self, directory: Path, script_path: Path) -> bool:
+    async def launch(self, directory: Path, script_path: Path) -> bool:
         """Launch terminal with script"""
         try:
             if self.platform == "wsl":
-                return self._launch_wsl(directory, script_path)
+                return await self._launch_wsl(directory, script_path)
             elif self.platform == "macos":
-                return self._launch_macos(directory, script_path)
+                return await self._launch_macos(directory, script_path)
             elif self.platform == "linux":
-                return self._launch_linux(directory, script_path)
+                return await self._launch_linux(directory, script_path)
             else:
                 logger.error(f"Unsupported platform: {self.platform}")
                 return False
@@ -409,54 +547,94 @@ class TerminalLauncher:
             logger.error(f"Error launching terminal: {e}")
             return False
     
-    def _launch_wsl(self, directory: Path, script_path: Path) -> bool:
-        """Launch terminal on WSL"""
+    async def launch_batch(self, pairs: List[Tuple[Path, Path]]) -> bool:
+        """Launch terminals for several (directory, script) pairs with one process where possible"""
         try:
-            # Convert paths
-            win_path = subprocess.check_output(
-                ["wslpath", "-w", str(directory)], text=True
-            ).strip()
-            wsl_path = str(directory)
-            
-            # Try Windows Terminal first
-            if self._check_command_exists("wt.exe"):
-                cmd = self.terminal_cmds["wt"]
-                cmd = [c.format(path=win_path, wsl_path=wsl_path, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
+            if self.platform == "wsl" and self._check_command_exists("wt.exe"):
+                # One Windows Terminal window with a tab per directory
+                cmd = await self._wsl_command("wt", *pairs[0])
+                for directory, script_path in pairs[1:]:
+                    cmd += [";", "new-tab"] + (await self._wsl_command("wt", directory, script_path))[1:]
+                await self._spawn(cmd)
                 return True
-            else:
-                # Fallback to cmd
-                cmd = self.terminal_cmds["cmd"]
-                cmd = [c.format(path=win_path, wsl_path=wsl_path, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
+            
+            if self.platform == "macos" and self._check_command_exists("osascript"):
+                # All windows opened by a single AppleScript run
+                terminal_type = "iterm" if self._has_iterm() else "terminal"
+                script_template = self.terminal_cmds[terminal_type]["script"]
+                script = "".join(script_template.format(path=directory, script=script_path)
+                                 for directory, script_path in pairs)
+                proc = await asyncio.create_subprocess_exec("osascript", "-e", script)
+                await proc.wait()
                 return True
+        except Exception as e:
+            logger.error(f"Batch launch error: {e}")
+            return False
+        
+        # No single-process form here; launch one terminal per directory
+        return all([await self.launch(directory, script_path) for directory, script_path in pairs])
+    
+    async def _win_path(self, directory: Path) -> str:
+        """Windows form of a directory, running wslpath without blocking the loop when needed"""
+        path = str(directory)
+        win_path = _wslpath_w(path) or self._win_paths.get(path)
+        if win_path is None:
+            proc = await asyncio.create_subprocess_exec(
+                "wslpath", "-w", path, stdout=subprocess.PIPE
+            )
+            stdout, _ = await proc.communicate()
+            if proc.returncode:
+                raise subprocess.CalledProcessError(proc.returncode, "wslpath")
+            win_path = self._win_paths[path] = stdout.decode().strip()
+        return win_path
+    
+    async def _wsl_command(self, terminal: str, directory: Path, script_path: Path) -> List[str]:
+        """Build the Windows-side command line for one directory"""
+        # Convert paths
+        win_path = await self._win_path(directory)
+        wsl_path = str(directory)
+        return [c.format(path=win_path, wsl_path=wsl_path, script=script_path)
+                for c in self.terminal_cmds[terminal]]
+    
+    async def _launch_wsl(self, directory: Path, script_path: Path) -> bool:
+        """Launch terminal on WSL"""
+        try:
+            # Try Windows Terminal first, fall back to cmd
+            terminal = "wt" if self._check_command_exists("wt.exe") else "cmd"
+            await self._spawn(await self._wsl_command(terminal, directory, script_path))
+            return True
                 
         except Exception as e:
             logger.error(f"WSL launch error: {e}")
             return False
     
-    def _launch_macos(self, directory: Path, script_path: Path) -> bool:
+    async def _launch_macos(self, directory: Path, script_path: Path) -> bool:
         """Launch terminal on macOS"""
         try:
             # Try iTerm first if available
             if self._check_command_exists("osascript"):
-                if subprocess.run(["osascript", "-e", 'tell application "System Events" to get name of every process'], 
-                                capture_output=True, text=True).stdout.find("iTerm") != -1:
-                    terminal_type = "iterm"
-                else:
-                    terminal_type = "terminal"
+                terminal_type = "iterm" if self._has_iterm() else "terminal"
                 
                 script_template = self.terminal_cmds[terminal_type]["script"]
                 script = script_template.format(path=directory, script=script_path)
                 
-                subprocess.run(["osascript", "-e", script])
+                # osascript returns once the window is open, so wait for it directly
+                proc = await asyncio.create_subprocess_exec("osascript", "-e", script)
+                await proc.wait()
                 return True
                 
         except Exception as e:
             logger.error(f"macOS launch error: {e}")
             return False
     
-    def _launch_linux(self, directory: Path, script_path: Path) -> bool:
+    def _has_iterm(self) -> bool:
+        """Check once whether iTerm is installed"""
+        if self._iterm is None:
+            self._iterm = (os.path.isdir('/Applications/iTerm.app') or
+                           os.path.isdir(os.path.expanduser('~/Applications/iTerm.app')))
+        return self._iterm
+    
+    async def _launch_linux(self, directory: Path, script_path: Path) -> bool:
         """Launch terminal on Linux"""
         terminals = ["gnome-terminal", "konsole", "xterm", "terminator"]
         
@@ -464,56 +642,58 @@ class TerminalLauncher:
             if self._check_command_exists(term):
                 cmd = self.terminal_cmds[term]
                 cmd = [c.format(path=directory, script=script_path) for c in cmd]
-                subprocess.Popen(cmd)
+                await self._spawn(cmd)
                 return True
         
         logger.error("No supported terminal found on Linux")
         return False
     
+    async def _spawn(self, cmd: List[str]):
+        """Start a terminal launcher in its own session and track it for wait_for_launchers"""
+        # A new session keeps the terminal out of the runner's process group, so
+        # Ctrl-C in the runner does not reach it; Popen (unlike an asyncio
+        # subprocess) also leaves it running when the event loop closes
+        self._launchers.append(subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        ))
+    
+    async def wait_for_launchers(self, grace: float = 1.0):
+        """Reap launchers that exit within a short grace period and leave the rest running"""
+        # Most launchers hand off to the terminal and exit at once; some
+        # (e.g. xterm) stay in the foreground until their window is closed
+        deadline = time.monotonic() + grace
+        pending = self._launchers
+        while True:
+            pending = [proc for proc in pending if proc.poll() is None]
+            if not pending or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(0.05)
+        
+        if pending:
+            logger.info(f"Leaving {len(pending)} foreground terminal(s) running")
+        self._launchers.clear()
+    
     def _check_command_exists(self, command: str) -> bool:
         """Check if a command exists"""
-        try:
-            subprocess.run([command, "--version"], capture_output=True, check=True)
-            return True
-        except:
-            return False
+        if command not in self._available:
+            self._available[command] = shutil.which(command)
+        return self._available[command] is not None
 
-class ClaudeAutomation:
-    """Handle Claude Code automation using pexpect or subprocess"""
-    
-    def __init__(self, directory: Path, init_content: str, continue_content: str):
-        self.directory = directory
-        self.init_content = init_content
-        self.continue_content = continue_content
-        self.use_pexpect = pexpect is not None and platform.system().lower() != "windows"
-    
-    def create_script(self) -> Path:
-        """Create automation script"""
-        script_name = f"claude_auto_{self.directory.name}.sh"
-        script_path = self.directory / script_name
-        
-        if self.use_pexpect:
-            script_content = self._create_pexpect_script()
-        else:
-            script_content = self._create_basic_script()
-        
-        with open(script_path, 'w') as f:
-            f.write(script_content)
-        
-        os.chmod(script_path, 0o755)
-        logger.info(f"Created automation script: {script_path}")
-        return script_path
-    
-    def _create_pexpect_script(self) -> str:
-        """Create script using pexpect for better automation"""
-        return f'''#!/usr/bin/env python3
+# Script templates, filled with str.format_map. The scripts read the
+# instruction files themselves, so their text is never embedded here.
+_PEXPECT_TMPL = '''#!/usr/bin/env python3
 import pexpect
 import sys
 import time
 import os
 
-os.chdir("{self.directory}")
-print(f"Working in: {self.directory}")
+os.chdir({directory!r})
+print(f"Working in: {{os.getcwd()}}")
+
+with open({init_file!r}, encoding="utf-8") as f:
+    init_content = f.read()
+with open({continue_file!r}, encoding="utf-8") as f:
+    continue_content = f.read()
 
 # Try to resume session
 print("Attempting to resume Claude Code session...")
@@ -529,7 +709,7 @@ try:
         child.expect([".*>", ".*$"], timeout=10)
         
         # Send continue content if available, otherwise init
-        content = """{self.continue_content if self.continue_content else self.init_content}"""
+        content = continue_content if continue_content else init_content
         print("\\nSending instructions...")
         child.sendline(content)
         
@@ -548,13 +728,13 @@ try:
         
         # Send init content
         print("\\nSending initialization instructions...")
-        child.sendline("""{self.init_content}""")
+        child.sendline(init_content)
         child.expect([".*>", ".*$"], timeout=10)
         
         # If we have different continue content, send it too
-        if self.continue_content and self.continue_content != self.init_content:
+        if continue_content and continue_content != init_content:
             print("\\nSending main instructions...")
-            child.sendline("""{self.continue_content}""")
+            child.sendline(continue_content)
     
     # Keep interactive
     print("\\nClaude Code is ready. Switching to interactive mode...")
@@ -565,34 +745,18 @@ except Exception as e:
     child.close()
     sys.exit(1)
 '''
-    
-    def _create_basic_script(self) -> str:
-        """Create basic script for platforms without pexpect"""
-        return f'''#!/bin/bash
+
+_BASIC_TMPL = '''#!/bin/bash
 # Claude Code Automation Script
-# Directory: {self.directory.name}
+# Directory: {name}
 
 set -e
-cd "{self.directory}"
+cd "{directory}"
 echo "Working in: $(pwd)"
 
-# Create temporary files for instructions
-INIT_FILE=$(mktemp)
-CONTINUE_FILE=$(mktemp)
-
-cat > "$INIT_FILE" << 'EOF'
-{self.init_content}
-EOF
-
-cat > "$CONTINUE_FILE" << 'EOF'
-{self.continue_content}
-EOF
-
-# Function to cleanup
-cleanup() {{
-    rm -f "$INIT_FILE" "$CONTINUE_FILE"
-}}
-trap cleanup EXIT
+# Instruction files
+INIT_FILE="{init_file}"
+CONTINUE_FILE="{continue_file}"
 
 echo "Starting Claude Code automation..."
 
@@ -648,6 +812,50 @@ fi
 '''
 
 
+class ClaudeAutomation:
+    """Handle Claude Code automation using pexpect or subprocess"""
+    
+    def __init__(self, directory: Path, init_path: Path, continue_path: Path):
+        self.directory = directory
+        # Absolute, since the script changes into the target directory first
+        self.init_file = Path(os.path.abspath(init_path))
+        self.continue_file = Path(os.path.abspath(continue_path))
+        self.use_pexpect = pexpect is not None and platform.system().lower() != "windows"
+    
+    def create_script(self) -> Path:
+        """Create automation script"""
+        script_name = f"claude_auto_{self.directory.name}.sh"
+        script_path = self.directory / script_name
+        
+        if self.use_pexpect:
+            script_content = self._create_pexpect_script()
+        else:
+            script_content = self._create_basic_script()
+        
+        script_path.write_text(script_content, encoding='utf-8')
+        
+        os.chmod(script_path, 0o755)
+        logger.info(f"Created automation script: {script_path}")
+        return script_path
+    
+    def _template_fields(self) -> Dict[str, Any]:
+        """Values substituted into the script templates"""
+        return {
+            "name": self.directory.name,
+            "directory": str(self.directory),
+            "init_file": str(self.init_file),
+            "continue_file": str(self.continue_file),
+        }
+    
+    def _create_pexpect_script(self) -> str:
+        """Create script using pexpect for better automation"""
+        return _PEXPECT_TMPL.format_map(self._template_fields())
+    
+    def _create_basic_script(self) -> str:
+        """Create basic script for platforms without pexpect"""
+        return _BASIC_TMPL.format_map(self._template_fields())
+
+
 def main():
     """Main entry point with stage support"""
     parser = argparse.ArgumentParser(
@@ -671,6 +879,7 @@ Examples:
   # Advanced options
   %(prog)s /path/to/projects --stage deploy_test --parallel --max-parallel 5
   %(prog)s /path/to/projects --stage upgrade --dry-run --verbose
+  %(prog)s /path/to/projects --stage document --batch
         """
     )
     
@@ -703,6 +912,9 @@ Examples:
     parser.add_argument("--max-parallel", type=int, default=3,
                        help="Maximum parallel launches")
     
+    parser.add_argument("--batch", action="store_true",
+                       help="Open all terminals with a single launch (one tabbed window on WSL)")
+    
     parser.add_argument("--list-stages", action="store_true",
                        help="List available stages and exit")
     
@@ -778,7 +990,8 @@ Examples:
             exclude=exclude,
             dry_run=args.dry_run,
             parallel=args.parallel,
-            max_parallel=args.max_parallel
+            max_parallel=args.max_parallel,
+            batch=args.batch
         )
         
     except KeyboardInterrupt: